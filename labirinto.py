@@ -3,6 +3,9 @@ import matplotlib.pyplot as plt
 import random
 import time
 import heapq
+import queue
+import threading
+from collections import namedtuple
 
 # ==========================================================================
 # --- CONFIGURAÇÕES GERAIS DA SIMULAÇÃO E VISUALIZAÇÃO ---
@@ -19,7 +22,12 @@ CHANCE_VITORIA_PRISIONEIRO  = 0.01  # 0.01 = 1%
 ## --- Aparência do Grafo ---
 USAR_LAYOUT_DE_GRADE        = True  # True para desenhar em grade (usa posicoes.txt), False para layout automático.
 TAMANHO_JANELA              = (12, 8) # (Largura, Altura)
-VELOCIDADE_SIMULACAO_SEGUNDOS = 0.7   # Menor = mais rápido
+VELOCIDADE_SIMULACAO_SEGUNDOS = 0.7   # Duração de cada turno da simulação. Menor = mais rápido
+
+## --- Renderização Desacoplada ---
+INTERVALO_RENDER_SEGUNDOS   = 0.05  # Pausa do renderizador após cada frame desenhado.
+TAMANHO_FILA_FRAMES         = 8     # Quantos estados aguardam o desenho antes de a fila encher.
+DESCARTAR_FRAMES_ATRASADOS  = True  # True desenha sempre o estado mais recente, False desenha todos os turnos.
 
 ## --- Estilo dos Nós (Círculos) ---
 TAMANHO_NO                  = 400
@@ -183,7 +191,11 @@ class Prisioneiro:
     """Representa o Prisioneiro e sua lógica de movimento de exploração (DFS)."""
     def __init__(self, pos_inicial):
         self.posicao_atual = pos_inicial
-        self.caminho_percorrido = [pos_inicial] # Log de todos os vértices visitados em ordem.
+        # Log de todos os vértices visitados em ordem.
+        # ATENÇÃO: o renderizador lê esta lista em outra thread (ver 'capturar_estado'),
+        # recortando o prefixo de cada snapshot. Ela deve ser apenas estendida com
+        # 'append': remover ou alterar itens corromperia os frames já enfileirados.
+        self.caminho_percorrido = [pos_inicial]
         self.visitados = {pos_inicial}          # Conjunto de vértices únicos já visitados.
         self.pilha_dfs = [pos_inicial]          # Pilha para a lógica de backtracking do DFS.
 
@@ -224,6 +236,7 @@ class Minotauro:
         self.perseguindo = False
         self.vivo = True
         self.caminho_patrulha = [] # Armazena o caminho a ser seguido na patrulha.
+        self.mensagens = []        # Mensagens do turno, exibidas no console junto com o frame.
 
     def mover(self, labirinto, pos_prisioneiro):
         """Executa a lógica de movimento do Minotauro para um turno."""
@@ -239,7 +252,7 @@ class Minotauro:
         if perseguindo_agora:
             # Lógica de Perseguição
             if not self.perseguindo:
-                print(f"!!! MINOTAURO DETECTOU O PRISIONEIRO a uma distância de {dist_ate_prisioneiro} !!!")
+                self.mensagens.append(f"!!! MINOTAURO DETECTOU O PRISIONEIRO a uma distância de {dist_ate_prisioneiro} !!!")
             self.perseguindo, self.caminho_patrulha = True, [] # Abandona a patrulha
             caminho_perseguicao = reconstruir_caminho(predecessores, self.posicao_atual, pos_prisioneiro)
             
@@ -249,7 +262,7 @@ class Minotauro:
         
         else:
             # Lógica de Patrulha Inteligente
-            if self.perseguindo: print("Minotauro perdeu o rastro.")
+            if self.perseguindo: self.mensagens.append("Minotauro perdeu o rastro.")
             self.perseguindo = False
             
             # Se a patrulha terminou ou não existe, cria uma nova.
@@ -298,44 +311,49 @@ def carregar_posicoes(nome_arquivo, nos_do_grafo):
     
     return posicoes
 
-def desenhar_labirinto(labirinto, prisioneiro, minotauro, posicoes_layout, turno, posicao_batalha=None, resultado_final=""):
-    """Renderiza um frame da simulação usando Matplotlib."""
+def desenhar_labirinto(labirinto, estado, posicoes_layout):
+    """Renderiza um frame da simulação a partir de um snapshot de estado."""
     plt.clf() # Limpa o frame anterior.
     G = nx.Graph(labirinto.grafo)
+
+    # Recorta o caminho do prisioneiro até o turno do snapshot.
+    # Os vértices visitados são exatamente os que aparecem nesse caminho.
+    caminho_prisioneiro = estado.caminho_prisioneiro[:estado.passos_prisioneiro]
+    visitados = set(caminho_prisioneiro)
     
     # Desenha os elementos visuais em camadas.
     nx.draw_networkx_edges(G, pos=posicoes_layout, edge_color=COR_ARESTA_NORMAL, width=LARGURA_ARESTA_NORMAL)
     
     # Desenha o "novelo de lã" do prisioneiro.
-    if len(prisioneiro.caminho_percorrido) > 1:
-        arestas_do_caminho = list(zip(prisioneiro.caminho_percorrido, prisioneiro.caminho_percorrido[1:]))
+    if len(caminho_prisioneiro) > 1:
+        arestas_do_caminho = list(zip(caminho_prisioneiro, caminho_prisioneiro[1:]))
         nx.draw_networkx_edges(G, pos=posicoes_layout, edgelist=arestas_do_caminho, edge_color=COR_ARESTA_CAMINHO, width=LARGURA_ARESTA_CAMINHO, style=ESTILO_ARESTA_CAMINHO)
         
     # Desenha o caminho de patrulha do Minotauro.
-    if not minotauro.perseguindo and len(minotauro.caminho_patrulha) > 1:
-        arestas_patrulha = list(zip(minotauro.caminho_patrulha, minotauro.caminho_patrulha[1:]))
+    if not estado.minotauro_perseguindo and len(estado.caminho_patrulha) > 1:
+        arestas_patrulha = list(zip(estado.caminho_patrulha, estado.caminho_patrulha[1:]))
         nx.draw_networkx_edges(G, pos=posicoes_layout, edgelist=arestas_patrulha, edge_color=COR_NO_MINOTAURO, width=1.5, style='dotted')
 
     # Determina o nó de destino da patrulha para destaque.
     destino_minotauro = None
-    if not minotauro.perseguindo and minotauro.caminho_patrulha:
-        destino_minotauro = minotauro.caminho_patrulha[-1]
+    if not estado.minotauro_perseguindo and estado.caminho_patrulha:
+        destino_minotauro = estado.caminho_patrulha[-1]
 
     # Define a cor de cada nó com base no estado atual da simulação.
     cores_nos = []
     for node in G.nodes():
         # Lógica especial para colorir o nó da batalha no frame final.
-        if node == posicao_batalha:
-            if "Vitória milagrosa" in resultado_final: cores_nos.append(COR_NO_PRISIONEIRO); continue
-            elif "derrotado" in resultado_final: cores_nos.append(COR_NO_MINOTAURO); continue
+        if node == estado.posicao_batalha:
+            if "Vitória milagrosa" in estado.resultado_final: cores_nos.append(COR_NO_PRISIONEIRO); continue
+            elif "derrotado" in estado.resultado_final: cores_nos.append(COR_NO_MINOTAURO); continue
         
         # Define a cor com base na hierarquia de prioridade.
-        if node == prisioneiro.posicao_atual: cores_nos.append(COR_NO_PRISIONEIRO)
-        elif minotauro.vivo and node == minotauro.posicao_atual: cores_nos.append(COR_NO_MINOTAURO)
+        if node == estado.pos_prisioneiro: cores_nos.append(COR_NO_PRISIONEIRO)
+        elif estado.minotauro_vivo and node == estado.pos_minotauro: cores_nos.append(COR_NO_MINOTAURO)
         elif node == labirinto.saida: cores_nos.append(COR_NO_SAIDA)
         elif node == labirinto.entrada: cores_nos.append(COR_NO_ENTRADA)
         elif node == destino_minotauro: cores_nos.append(COR_NO_DESTINO_MINOTAURO)
-        elif node in prisioneiro.visitados: cores_nos.append(COR_NO_VISITADO)
+        elif node in visitados: cores_nos.append(COR_NO_VISITADO)
         else: cores_nos.append(COR_NO_NAO_VISITADO)
         
     # Desenha os nós e seus rótulos.
@@ -347,13 +365,13 @@ def desenhar_labirinto(labirinto, prisioneiro, minotauro, posicoes_layout, turno
     nx.draw_networkx_edge_labels(G, pos=posicoes_layout, edge_labels=pesos, font_size=TAMANHO_FONTE_PESO, font_color=COR_FONTE_PESO, label_pos=POSICAO_LABEL_PESO)
     
     # Atualiza os títulos da janela e do gráfico.
-    plt.title(f"Turno: {turno} | Tempo Restante: {labirinto.tempo_maximo - turno}")
-    titulo_janela = f"Simulação: Labirinto de Creta | Turno {turno} de {labirinto.tempo_maximo}"
+    plt.title(f"Turno: {estado.turno} | Tempo Restante: {labirinto.tempo_maximo - estado.turno}")
+    titulo_janela = f"Simulação: Labirinto de Creta | Turno {estado.turno} de {labirinto.tempo_maximo}"
     plt.gcf().canvas.manager.set_window_title(titulo_janela)
     
-    # Renderiza o frame e pausa a execução para criar a animação.
+    # Renderiza o frame e devolve o controle ao loop de eventos da janela.
     plt.draw()
-    plt.pause(VELOCIDADE_SIMULACAO_SEGUNDOS)
+    plt.pause(INTERVALO_RENDER_SEGUNDOS)
 
 def imprimir_relatorio_final(resultado, tempo_restante, prisioneiro, turno_final, turno_deteccao, turno_batalha, caminho_perseguicao):
     """Exibe o relatório final da simulação no console."""
@@ -376,17 +394,101 @@ def imprimir_relatorio_final(resultado, tempo_restante, prisioneiro, turno_final
     print("="*40)
 
 # --------------------------------------------------------------------------
-# LOOP PRINCIPAL DA SIMULAÇÃO
+# SNAPSHOTS DE ESTADO E RENDERIZAÇÃO DESACOPLADA
 # --------------------------------------------------------------------------
-def main():
-    """Função principal que orquestra a execução da simulação."""
-    # Inicialização: Carrega o labirinto e os personagens.
-    try:
-        labirinto = Labirinto(ARQUIVO_LABIRINTO)
-    except FileNotFoundError:
-        print(f"ERRO: Arquivo '{ARQUIVO_LABIRINTO}' não encontrado. Execute o 'gerador_de_configuracao.py' primeiro.")
-        return
+# Estado imutável de um turno. A simulação (produtora) publica um snapshot por
+# turno e o renderizador (consumidor) desenha a partir dele, sem tocar nos
+# objetos dos personagens, que continuam sendo alterados em paralelo.
+# A única exceção é o caminho do prisioneiro: como 'Prisioneiro.caminho_percorrido'
+# é apenas estendido com 'append' (invariante documentada na classe), o snapshot
+# guarda a própria lista e o número de passos daquele turno. Esse prefixo não muda
+# mais, e a cópia (O(turnos)) só é feita pelo renderizador para os frames desenhados.
+EstadoTurno = namedtuple('EstadoTurno', [
+    'turno', 'pos_prisioneiro', 'caminho_prisioneiro', 'passos_prisioneiro',
+    'pos_minotauro', 'minotauro_vivo', 'minotauro_perseguindo', 'caminho_patrulha',
+    'posicao_batalha', 'resultado_final', 'mensagens',
+])
+
+# Marcador publicado na fila quando a simulação termina.
+FIM_DA_SIMULACAO = object()
+
+def capturar_estado(prisioneiro, minotauro, turno, posicao_batalha=None, resultado_final="", mensagens=()):
+    """Registra o estado atual dos personagens em um snapshot imutável."""
+    return EstadoTurno(
+        turno=turno,
+        pos_prisioneiro=prisioneiro.posicao_atual,
+        caminho_prisioneiro=prisioneiro.caminho_percorrido,
+        passos_prisioneiro=len(prisioneiro.caminho_percorrido),
+        pos_minotauro=minotauro.posicao_atual,
+        minotauro_vivo=minotauro.vivo,
+        minotauro_perseguindo=minotauro.perseguindo,
+        caminho_patrulha=tuple(minotauro.caminho_patrulha),
+        posicao_batalha=posicao_batalha,
+        resultado_final=resultado_final,
+        mensagens=tuple(mensagens),
+    )
+
+def publicar_estado(fila_frames, estado):
+    """
+    Envia um snapshot para o renderizador.
+    Com DESCARTAR_FRAMES_ATRASADOS, a simulação nunca espera pelo desenho: se o
+    renderizador ficar para trás e a fila encher, os snapshots pendentes são
+    descartados e suas mensagens seguem, em ordem, à frente das do novo snapshot.
+    Caso contrário, a simulação aguarda até que haja espaço (todos os frames são exibidos).
+    """
+    if not DESCARTAR_FRAMES_ATRASADOS:
+        fila_frames.put(estado); return
+
+    while True:
+        try:
+            fila_frames.put_nowait(estado); return
+        except queue.Full:
+            # Fila cheia: esvazia a fila (o renderizador só desenharia o mais recente)
+            # e antepõe as mensagens dos frames descartados, na ordem dos turnos.
+            mensagens_descartadas = ()
+            while True:
+                try: descartado = fila_frames.get_nowait()
+                except queue.Empty: break
+                mensagens_descartadas += descartado.mensagens
+            estado = estado._replace(mensagens=mensagens_descartadas + estado.mensagens)
+
+def renderizar_estados(labirinto, fila_frames, posicoes_layout):
+    """
+    Consome os snapshots da fila e os desenha até receber FIM_DA_SIMULACAO.
+    Com DESCARTAR_FRAMES_ATRASADOS, pula os frames que ficaram para trás e
+    desenha apenas o estado mais recente disponível. As mensagens de console de
+    cada snapshot são impressas aqui, em sincronia com a janela.
+    """
+    encerrado = False
+    while not encerrado:
+        try:
+            estado = fila_frames.get(timeout=INTERVALO_RENDER_SEGUNDOS)
+        except queue.Empty:
+            # Sem frame novo: mantém a janela responsiva enquanto aguarda.
+            plt.pause(INTERVALO_RENDER_SEGUNDOS); continue
+        if estado is FIM_DA_SIMULACAO: break
+        for mensagem in estado.mensagens: print(mensagem)
+
+        if DESCARTAR_FRAMES_ATRASADOS:
+            # Esvazia a fila, mantendo apenas o snapshot mais recente.
+            while True:
+                try: proximo = fila_frames.get_nowait()
+                except queue.Empty: break
+                if proximo is FIM_DA_SIMULACAO:
+                    encerrado = True; break
+                estado = proximo
+                for mensagem in estado.mensagens: print(mensagem)
+
+        desenhar_labirinto(labirinto, estado, posicoes_layout)
 
+# --------------------------------------------------------------------------
+# LOOP PRINCIPAL DA SIMULAÇÃO
+# --------------------------------------------------------------------------
+def simular_turnos(labirinto, fila_frames):
+    """
+    Executa o loop de turnos da simulação, publicando um snapshot por turno
+    na fila de frames. Retorna os dados do relatório final.
+    """
     prisioneiro = Prisioneiro(labirinto.entrada)
     minotauro = Minotauro(labirinto.pos_inicial_minotauro)
     
@@ -394,11 +496,7 @@ def main():
     resultado_final = ""
     turno_deteccao, turno_batalha, posicao_batalha = None, None, None
     caminho_perseguicao_minotauro = []
-    
-    posicoes_layout = carregar_posicoes(ARQUIVO_POSICOES, labirinto.grafo)
-    
-    # Configuração da janela Matplotlib para modo interativo.
-    plt.ion(); plt.figure(figsize=TAMANHO_JANELA); turno = 0
+    turno = 0
 
     # Loop principal, executado a cada turno da simulação.
     for turno in range(1, labirinto.tempo_maximo + 1):
@@ -406,6 +504,9 @@ def main():
         # Lógica de movimento dos personagens.
         prisioneiro.mover(labirinto)
         minotauro.mover(labirinto, prisioneiro.posicao_atual)
+
+        # Mensagens do turno, entregues ao renderizador junto com o snapshot.
+        mensagens, minotauro.mensagens = minotauro.mensagens, []
         
         # Registra os dados de log do turno atual.
         if minotauro.perseguindo and minotauro.vivo:
@@ -415,30 +516,32 @@ def main():
         # Lógica de encontro e batalha.
         if minotauro.vivo and minotauro.posicao_atual == prisioneiro.posicao_atual:
             turno_batalha, posicao_batalha = turno, minotauro.posicao_atual
-            print("\n--- ENCONTRO! UMA BATALHA SE INICIA! ---")
+            mensagens.append("\n--- ENCONTRO! UMA BATALHA SE INICIA! ---")
             if random.random() <= CHANCE_VITORIA_PRISIONEIRO:
                 resultado_final = "Vitória milagrosa! O Prisioneiro derrotou o Minotauro!"
-                print(f"Resultado da Batalha: {resultado_final}"); minotauro.vivo = False
+                mensagens.append(f"Resultado da Batalha: {resultado_final}"); minotauro.vivo = False
             else:
                 resultado_final = "O Prisioneiro foi derrotado e devorado pelo Minotauro."
-                print(f"Resultado da Batalha: {resultado_final}")
-                # Desenha o frame da derrota antes de encerrar o loop.
-                desenhar_labirinto(labirinto, prisioneiro, minotauro, posicoes_layout, turno, posicao_batalha, resultado_final)
+                mensagens.append(f"Resultado da Batalha: {resultado_final}")
+                # Publica o frame da derrota antes de encerrar o loop.
+                publicar_estado(fila_frames, capturar_estado(prisioneiro, minotauro, turno, posicao_batalha, resultado_final, mensagens))
                 break
         
-        # Desenha o estado atual do labirinto.
-        desenhar_labirinto(labirinto, prisioneiro, minotauro, posicoes_layout, turno, posicao_batalha, resultado_final)
+        # Publica o estado atual do labirinto para o renderizador.
+        publicar_estado(fila_frames, capturar_estado(prisioneiro, minotauro, turno, posicao_batalha, resultado_final, mensagens))
 
         # Condição de vitória do prisioneiro.
         if prisioneiro.posicao_atual == labirinto.saida:
             resultado_final = "O Prisioneiro encontrou a saída e escapou!"; break
 
+        # Ritmo próprio da simulação, independente do tempo de desenho.
+        time.sleep(VELOCIDADE_SIMULACAO_SEGUNDOS)
+
     # Se o loop terminar por tempo, define o resultado final.
     if not resultado_final:
         resultado_final = "O tempo acabou! O Prisioneiro não conseguiu escapar."
-    
-    # Gera o relatório de texto no console.
-    imprimir_relatorio_final(
+
+    return dict(
         resultado=resultado_final,
         tempo_restante=labirinto.tempo_maximo - turno,
         prisioneiro=prisioneiro,
@@ -447,6 +550,51 @@ def main():
         turno_batalha=turno_batalha,
         caminho_perseguicao=caminho_perseguicao_minotauro
     )
+
+def executar_simulacao(labirinto, fila_frames, relatorio):
+    """
+    Corpo da thread produtora. Grava em 'relatorio' os dados do relatório final
+    ou, se a simulação falhar, a exceção em 'relatorio['erro']'.
+    """
+    try:
+        relatorio.update(simular_turnos(labirinto, fila_frames))
+    except Exception as erro:
+        relatorio['erro'] = erro
+    finally:
+        # Avisa o renderizador que não haverá mais frames, mesmo em caso de erro.
+        # O put bloqueante garante que o último frame publicado não seja descartado.
+        fila_frames.put(FIM_DA_SIMULACAO)
+
+def main():
+    """Função principal que orquestra a execução da simulação."""
+    # Inicialização: Carrega o labirinto.
+    try:
+        labirinto = Labirinto(ARQUIVO_LABIRINTO)
+    except FileNotFoundError:
+        print(f"ERRO: Arquivo '{ARQUIVO_LABIRINTO}' não encontrado. Execute o 'gerador_de_configuracao.py' primeiro.")
+        return
+
+    posicoes_layout = carregar_posicoes(ARQUIVO_POSICOES, labirinto.grafo)
+    
+    # Configuração da janela Matplotlib para modo interativo.
+    plt.ion(); plt.figure(figsize=TAMANHO_JANELA)
+
+    # A simulação roda em uma thread própria (produtora), enquanto o desenho fica
+    # na thread principal (consumidora), pois o Matplotlib não é thread-safe.
+    fila_frames = queue.Queue(maxsize=TAMANHO_FILA_FRAMES)
+    relatorio = {}
+    simulacao = threading.Thread(target=executar_simulacao, args=(labirinto, fila_frames, relatorio), daemon=True)
+    simulacao.start()
+
+    renderizar_estados(labirinto, fila_frames, posicoes_layout)
+    simulacao.join()
+
+    # Propaga para a thread principal qualquer erro ocorrido na simulação.
+    if 'erro' in relatorio:
+        raise relatorio['erro']
+    
+    # Gera o relatório de texto no console.
+    imprimir_relatorio_final(**relatorio)
     
     print("\nSimulação encerrada. A janela final mostra o último estado. Feche-a para terminar.")
     
@@ -0,0 +1,32 @@
+import queue
+
+import labirinto
+from labirinto import EstadoTurno, publicar_estado
+
+
+def estado_com_mensagem(turno):
+    """Cria um snapshot mínimo que carrega apenas a mensagem 'm<turno>'."""
+    return EstadoTurno(
+        turno=turno, pos_prisioneiro=None, caminho_prisioneiro=[], passos_prisioneiro=0,
+        pos_minotauro=None, minotauro_vivo=True, minotauro_perseguindo=False, caminho_patrulha=(),
+        posicao_batalha=None, resultado_final="", mensagens=(f"m{turno}",),
+    )
+
+
+def test_publicar_estado_preserva_ordem_das_mensagens_ao_descartar(monkeypatch):
+    monkeypatch.setattr(labirinto, 'DESCARTAR_FRAMES_ATRASADOS', True)
+    fila_frames = queue.Queue(maxsize=2)
+
+    for turno in range(5):
+        publicar_estado(fila_frames, estado_com_mensagem(turno))
+
+    # Mensagens na ordem em que o renderizador as imprimiria.
+    mensagens = []
+    turnos = []
+    while not fila_frames.empty():
+        estado = fila_frames.get_nowait()
+        turnos.append(estado.turno)
+        mensagens.extend(estado.mensagens)
+
+    assert mensagens == ["m0", "m1", "m2", "m3", "m4"]
+    assert turnos[-1] == 4